@@ -1,5 +1,8 @@
 # pip install reportlab pillow
 
+import functools
+import io
+import math
 import os
 from typing import Literal, Tuple
 
@@ -11,50 +14,85 @@ from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-# Pillow only used to generate a placeholder image if none exists
+# Pillow is used to pre-scale/darken the cover image and for the placeholder
 from PIL import Image, ImageDraw, ImageFont
 
+from width_cache import measure as measure_width
+
 # =========================
 # Typography / Layout utils
 # =========================
 
+@functools.lru_cache(maxsize=65536)
+def _sw(text: str, font_name: str, font_size: float) -> float:
+    return measure_width(text, font_name, font_size)
+
 def string_width(text: str, font_name: str, font_size: float) -> float:
-    return pdfmetrics.stringWidth(text, font_name, font_size)
+    """Memoized stringWidth (repeated words/titles are measured once)."""
+    return _sw(text, font_name, font_size)
 
 def wrap_text_to_width(text: str, font_name: str, font_size: float, max_width: float):
-    """Greedy word wrap based on stringWidth."""
+    """Greedy word wrap; line widths are summed from cached per-word widths."""
     words = text.split()
     if not words:
         return []
-    lines, line = [], words[0]
-    for w in words[1:]:
-        test = f"{line} {w}"
-        if string_width(test, font_name, font_size) <= max_width:
-            line = test
+    whole = " ".join(words)
+    if string_width(whole, font_name, font_size) <= max_width:
+        return [whole]
+    space_w = string_width(" ", font_name, font_size)
+    word_ws = [string_width(w, font_name, font_size) for w in words]
+    lines, line = [], [words[0]]
+    line_w = word_ws[0]
+    for w, word_w in zip(words[1:], word_ws[1:]):
+        new_w = line_w + space_w + word_w
+        if new_w <= max_width:
+            line.append(w)
+            line_w = new_w
         else:
-            lines.append(line)
-            line = w
-    lines.append(line)
+            lines.append(" ".join(line))
+            line, line_w = [w], word_w
+    lines.append(" ".join(line))
     return lines
 
 def auto_fit_font_size(text: str, font_name: str, max_width: float, max_size: float, min_size: float) -> float:
-    """Find a font size that makes one line of text fit max_width (descending)."""
-    size = max_size
-    while size >= min_size:
-        if string_width(text, font_name, size) <= max_width:
-            return size
-        size -= 1
-    return min_size
+    """Find a font size that makes one line of text fit max_width (descending).
+
+    Width is linear in font size, so one 1pt measurement gives the answer
+    without stepping down size by size.
+    """
+    unit_w = string_width(text, font_name, 1.0)
+    if unit_w <= 0:
+        return max_size
+    fit = max_width / unit_w
+    if fit >= max_size:
+        return max_size
+    # Same 1pt steps down from max_size as before, clamped to min_size
+    return max(min_size, max_size - math.ceil(max_size - fit))
+
+def _ensure_font(name: str, path: str) -> bool:
+    """Register a TTF once per process; False if it isn't registered and the file is missing."""
+    if name in pdfmetrics.getRegisteredFontNames():
+        return True
+    if not os.path.exists(path):
+        return False
+    pdfmetrics.registerFont(TTFont(name, path))
+    return True
+
+@functools.lru_cache(maxsize=256)
+def _hex_color(hex_str: str, alpha: float = 1.0):
+    """Parse a hex colour (with alpha) once and reuse the Color object."""
+    col = colors.HexColor(hex_str)
+    if alpha == 1.0:
+        return col
+    return colors.Color(col.red, col.green, col.blue, alpha=alpha)
 
 def draw_rounded_panel(c, x, y, w, h, *, radius=5, fill_hex="#000000", alpha=0.40, stroke=0):
     """Semi-opaque rounded rectangle to sit behind text."""
-    col = colors.HexColor(fill_hex)
-    c.setFillColor(colors.Color(col.red, col.green, col.blue, alpha=alpha))
+    c.setFillColor(_hex_color(fill_hex, alpha))
     c.roundRect(x, y, w, h, radius, stroke=stroke, fill=1)
 
 def draw_accent_bar(c, x, y, w, h, *, fill_hex="#4C8DF6", alpha=0.9):
-    col = colors.HexColor(fill_hex)
-    c.setFillColor(colors.Color(col.red, col.green, col.blue, alpha=alpha))
+    c.setFillColor(_hex_color(fill_hex, alpha))
     c.rect(x, y, w, h, stroke=0, fill=1)
 
 def draw_text_block(
@@ -81,9 +119,9 @@ def draw_text_block(
     max_subtitle_width = w - 2 * padding
 
     # Colors
-    title_color = colors.HexColor(colors_cfg.get("title", "#FFFFFF"))
-    subtitle_color = colors.HexColor(colors_cfg.get("subtitle", "#EDEDED"))
-    meta_color = colors.HexColor(colors_cfg.get("meta", "#CFCFCF"))
+    title_color = _hex_color(colors_cfg.get("title", "#FFFFFF"))
+    subtitle_color = _hex_color(colors_cfg.get("subtitle", "#EDEDED"))
+    meta_color = _hex_color(colors_cfg.get("meta", "#CFCFCF"))
     accent_hex = colors_cfg.get("accent", "#4C8DF6")
     panel_hex = colors_cfg.get("panel", "#05070B")
 
@@ -126,9 +164,15 @@ def draw_text_block(
     c.setFillColor(subtitle_color)
     c.setFont(fonts["light"], subtitle_size)
     sub_y = y + panel_h - padding - title_h - line_gap - subtitle_size
-    for line in subtitle_lines:
-        c.drawString(inner_x, sub_y, line)
-        sub_y -= subtitle_line_h
+    if len(subtitle_lines) > 1:
+        # One text object for the whole block instead of a BT/ET per line
+        sub_text = c.beginText(inner_x, sub_y)
+        sub_text.setFont(fonts["light"], subtitle_size, subtitle_line_h)
+        for line in subtitle_lines:
+            sub_text.textLine(line)
+        c.drawText(sub_text)
+    elif subtitle_lines:
+        c.drawString(inner_x, sub_y, subtitle_lines[0])
 
     # Draw META (right-aligned)
     right_margin = x + w - padding
@@ -143,6 +187,66 @@ def draw_text_block(
 # Background image util
 # ====================
 
+# (path, mtime_ns, size) -> (ImageReader, (w, h)); reused across cover sheets
+_IMAGE_CACHE = {}
+
+def _get_image(path: str):
+    """Return a cached (ImageReader, (w, h)) for path, reloading if the file changed."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    hit = _IMAGE_CACHE.get(key)
+    if hit:
+        return hit
+    img = ImageReader(path)
+    hit = _IMAGE_CACHE[key] = (img, img.getSize())
+    return hit
+
+# Target pixel density for the embedded cover image
+COVER_IMAGE_DPI = 200
+
+def _has_alpha(im) -> bool:
+    """True if a PIL image has an alpha band or palette/tRNS transparency."""
+    return im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info
+
+@functools.lru_cache(maxsize=64)
+def _file_has_alpha(path: str, mtime_ns: int, size: int) -> bool:
+    # header read only; the stat fields key the cache like _IMAGE_CACHE
+    with Image.open(path) as im:
+        return _has_alpha(im)
+
+def _image_has_alpha(path: str) -> bool:
+    st = os.stat(path)
+    return _file_has_alpha(path, st.st_mtime_ns, st.st_size)
+
+# (path, mtime_ns, size, px_size, darken) -> ImageReader over the re-encoded
+# image (JPEG, or PNG when the source has transparency)
+_PREPARED_IMAGE_CACHE = {}
+
+def _get_prepared_image(path: str, px_size: Tuple[int, int], darken: float):
+    """Resample to px_size and bake darken into the pixels once; cached."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, px_size, darken)
+    hit = _PREPARED_IMAGE_CACHE.get(key)
+    if hit:
+        return hit
+    im = Image.open(path)
+    # Transparent sources stay RGBA and go out as PNG so mask='auto' still
+    # applies; callers never bake darken into those (see draw_cover_image)
+    keep_alpha = _has_alpha(im)
+    im = im.convert("RGBA" if keep_alpha else "RGB")
+    if im.size != px_size:
+        im = im.resize(px_size, Image.LANCZOS)
+    if darken > 0:
+        im = Image.blend(im, Image.new("RGB", im.size, (0, 0, 0)), darken)
+    buf = io.BytesIO()
+    if keep_alpha:
+        im.save(buf, format="PNG")
+    else:
+        im.save(buf, format="JPEG", quality=90)
+    buf.seek(0)
+    hit = _PREPARED_IMAGE_CACHE[key] = ImageReader(buf)
+    return hit
+
 def draw_cover_image(
     c,
     image_path: str,
@@ -161,12 +265,11 @@ def draw_cover_image(
 
     if not os.path.exists(image_path):
         # fallback solid background
-        c.setFillColor(colors.HexColor("#1c1c1e"))
+        c.setFillColor(_hex_color("#1c1c1e"))
         c.rect(0, 0, width, height, stroke=0, fill=1)
         return
 
-    img = ImageReader(image_path)
-    img_w, img_h = img.getSize()
+    img, (img_w, img_h) = _get_image(image_path)
     img_aspect = img_h / float(img_w)
 
     # Cover-fit sizing
@@ -192,15 +295,49 @@ def draw_cover_image(
         x += offset_x                 # absolute points
         y += offset_y
 
+    darken = max(0.0, min(1.0, darken))
+
+    # Darken can only be baked into the pixels if the image covers the whole
+    # page and is opaque (the overlay also darkens what shows through)
+    covers_page = x <= 0 and y <= 0 and x + draw_w >= width and y + draw_h >= height
+    bake_darken = darken > 0 and covers_page and not _image_has_alpha(image_path)
+
+    # Downscale oversized sources to COVER_IMAGE_DPI (never upscale)
+    px_w = int(draw_w / 72.0 * COVER_IMAGE_DPI)
+    px_h = int(draw_h / 72.0 * COVER_IMAGE_DPI)
+    px_size = (px_w, px_h) if img_w > px_w else (img_w, img_h)
+
+    if bake_darken or px_size != (img_w, img_h):
+        img = _get_prepared_image(image_path, px_size, darken if bake_darken else 0.0)
+    elif os.path.splitext(image_path)[1].lower() in (".jpg", ".jpeg"):
+        # Untouched JPEG: hand drawImage the path so the DCT stream is embedded
+        # as-is, without decoding the pixels to fingerprint an ImageReader
+        img = image_path
+
     # Draw
     c.drawImage(img, x, y, width=draw_w, height=draw_h, mask='auto')
 
     # Optional darken overlay
-    if darken > 0:
-        darken = max(0.0, min(1.0, darken))
+    if darken > 0 and not bake_darken:
         c.setFillColor(colors.Color(0, 0, 0, alpha=darken))
         c.rect(0, 0, width, height, stroke=0, fill=1)
 
+def define_image_form(c, name, image, w, h):
+    """Record an image once as a Form XObject of size w x h (place with draw_form)."""
+    c.beginForm(name, lowerx=0, lowery=0, upperx=w, uppery=h)
+    try:
+        c.drawImage(image, 0, 0, width=w, height=h, mask='auto')
+    finally:
+        # an unclosed form swallows the rest of the page
+        c.endForm()
+
+def draw_form(c, name, x, y):
+    """Stamp a previously defined form with its origin at (x, y)."""
+    c.saveState()
+    c.translate(x, y)
+    c.doForm(name)
+    c.restoreState()
+
 # ===========
 # Main builder
 # ===========
@@ -252,22 +389,19 @@ def create_modern_cover_sheet(
     poppins_regular_path = os.path.join(fonts_path, regular_file)
 
     font_bold_name = "Helvetica-Bold"
-    if os.path.exists(poppins_bold_path):
-        pdfmetrics.registerFont(TTFont("Poppins-Bold", poppins_bold_path))
+    if _ensure_font("Poppins-Bold", poppins_bold_path):
         font_bold_name = "Poppins-Bold"
     else:
         print(f"Warning: Bold font not found at '{poppins_bold_path}'. Using default bold.")
 
     font_light_name = "Helvetica"  # fallback
-    if os.path.exists(poppins_light_path):
-        pdfmetrics.registerFont(TTFont("Poppins-Light", poppins_light_path))
+    if _ensure_font("Poppins-Light", poppins_light_path):
         font_light_name = "Poppins-Light"
     else:
         print(f"Warning: Light font not found at '{poppins_light_path}'. Using default.")
 
     font_regular_name = "Helvetica"
-    if os.path.exists(poppins_regular_path):
-        pdfmetrics.registerFont(TTFont("Poppins-Regular", poppins_regular_path))
+    if _ensure_font("Poppins-Regular", poppins_regular_path):
         font_regular_name = "Poppins-Regular"
     else:
         print(f"Warning: Regular font not found at '{poppins_regular_path}'. Using default.")
@@ -336,22 +470,20 @@ def create_modern_cover_sheet(
     # ========== Logo ==========
     if logo_path and os.path.exists(logo_path):
         try:
-            logo = ImageReader(logo_path)
+            logo, (logo_px_w, logo_px_h) = _get_image(logo_path)
+            logo.getRGBData()  # decode now: a broken file fails before the form is opened
             logo_w = logo_width
-            logo_h = logo_w * (logo.getSize()[1] / logo.getSize()[0])  # preserve aspect
+            logo_h = logo_w * (logo_px_h / logo_px_w)  # preserve aspect
             margin_x, margin_y = logo_margin
-            c.drawImage(
-                logo,
-                margin_x,
-                height - logo_h - margin_y,  # top-left placement
-                width=logo_w,
-                height=logo_h,
-                mask='auto'
-            )
+            # Logo lives in a Form XObject so any further pages stamp the same object
+            define_image_form(c, "logo", logo, logo_w, logo_h)
+            draw_form(c, "logo", margin_x, height - logo_h - margin_y)  # top-left placement
         except Exception as e:
             print(f"Warning: could not draw logo: {e}")
 
     # ========== Save ==========
+    # save() serializes the whole document in memory and hands it to the
+    # file in a single write(), so an extra buffered writer buys nothing.
     c.save()
     print(f"Successfully created modern cover sheet: {output_filename}")
 
@@ -369,6 +501,9 @@ if __name__ == "__main__":
 
     # Placeholder image if missing
     if not os.path.exists("assets/banner-2.jpg"):
+        # Keep fills in Pillow's C paths (Image.new, ImageDraw, or
+        # Image.linear_gradient + ImageOps.colorize for gradients);
+        # never loop over pixels with putpixel here.
         img = Image.new('RGB', (1200, 1800), color=(28, 28, 30))
         d = ImageDraw.Draw(img)
         try:
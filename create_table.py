@@ -1,5 +1,6 @@
 # pip install reportlab
 
+import functools
 import os
 from typing import List, Dict, Any
 
@@ -10,36 +11,67 @@ from reportlab.lib.units import inch
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from width_cache import measure as measure_width
+
+# Default table colours, parsed once
+_HEADER_FILL = colors.HexColor("#163b8a")
+_BORDER = colors.HexColor("#E5E7EB")
+_ALT_ROW = colors.HexColor("#F3F4F6")
+_DEFAULT_TEXT = colors.HexColor("#111827")
+_CAPTION_TEXT = colors.HexColor("#6B7280")
+
 # =========================
 # Typography / Layout Utils (Unchanged)
 # =========================
 
+def _ensure_font(name: str, path: str) -> bool:
+    """Register a TTF once per process; False if it isn't registered and the file is missing."""
+    if name in pdfmetrics.getRegisteredFontNames():
+        return True
+    if not os.path.exists(path):
+        return False
+    pdfmetrics.registerFont(TTFont(name, path))
+    return True
+
 def register_fonts(font_path="fonts", font_files=("Poppins-Bold.ttf", "Poppins-Regular.ttf")):
     os.makedirs(font_path, exist_ok=True)
     registered_fonts = {"bold": "Helvetica-Bold", "regular": "Helvetica"}
     for font_file, family_name in zip(font_files, ["bold", "regular"]):
         font_name = os.path.splitext(font_file)[0]
         full_path = os.path.join(font_path, font_file)
-        if os.path.exists(full_path):
-            pdfmetrics.registerFont(TTFont(font_name, full_path))
+        if _ensure_font(font_name, full_path):
             registered_fonts[family_name] = font_name
     return registered_fonts
 
+@functools.lru_cache(maxsize=65536)
+def _sw(text: str, font_name: str, font_size: float) -> float:
+    return measure_width(text, font_name, font_size)
+
 def string_width(text: str, font_name: str, font_size: float) -> float:
-    return pdfmetrics.stringWidth(str(text), font_name, font_size)
+    return _sw(str(text), font_name, font_size)
+
+def _greedy_breaks(word_ws: List[float], space_w: float, max_width: float) -> List[int]:
+    """Index of the first word of each line for a greedy fill of word widths."""
+    breaks = [0]
+    current_w = word_ws[0]
+    for i in range(1, len(word_ws)):
+        new_w = current_w + space_w + word_ws[i]
+        if new_w <= max_width:
+            current_w = new_w
+        else:
+            breaks.append(i)
+            current_w = word_ws[i]
+    return breaks
 
 def wrap_text_to_width(text: str, font_name: str, font_size: float, max_width: float) -> List[str]:
-    lines, words = [], str(text).split()
+    words = str(text).split()
     if not words: return [""]
-    current_line = words[0]
-    for word in words[1:]:
-        if string_width(f"{current_line} {word}", font_name, font_size) <= max_width:
-            current_line += f" {word}"
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
-    return lines
+    whole = " ".join(words)
+    if string_width(whole, font_name, font_size) <= max_width: return [whole]
+    space_w = string_width(" ", font_name, font_size)
+    word_ws = [string_width(word, font_name, font_size) for word in words]
+    breaks = _greedy_breaks(word_ws, space_w, max_width)
+    return [" ".join(words[a:b]) for a, b in zip(breaks, breaks[1:] + [len(words)])]
 
 # ============================
 # Table Drawing Logic with Caption
@@ -57,7 +89,7 @@ def draw_rounded_table(c: canvas.Canvas, x: float, y: float, config: Dict[str, A
     header_style = config.get("header_style", {})
     header_font = fonts.get(header_style.get("font", "bold"), fonts["bold"])
     header_font_size = header_style.get("font_size", 11)
-    header_fill = header_style.get("fill_color", colors.HexColor("#163b8a"))
+    header_fill = header_style.get("fill_color", _HEADER_FILL)
     header_text_color = header_style.get("text_color", colors.white)
     header_padding = header_style.get("padding", 8)
     header_height = header_font_size + 2 * header_padding
@@ -66,22 +98,42 @@ def draw_rounded_table(c: canvas.Canvas, x: float, y: float, config: Dict[str, A
     line_spacing = 1.2
     table_radius = config.get("radius", 8)
     
-    border_color = colors.HexColor("#E5E7EB")
-    alt_row_color = colors.HexColor("#F3F4F6")
-    default_text_color = colors.HexColor("#111827")
+    border_color = _BORDER
+    alt_row_color = _ALT_ROW
+    default_text_color = _DEFAULT_TEXT
+
+    # Flatten column styles once: (key, font, font_size, leading, wrap_width, align, text_color, x_offset, col_width)
+    cols = []
+    current_x = x
+    for key, style in column_styles.items():
+        font_size = style.get("font_size", 10)
+        cols.append((
+            key,
+            fonts.get(style.get("font", "regular"), fonts["regular"]),
+            font_size,
+            font_size * line_spacing,
+            style["width"] - 2 * cell_padding,
+            style.get("align", "LEFT").upper(),
+            style.get("text_color", default_text_color),
+            current_x,
+            style["width"],
+        ))
+        current_x += style["width"]
     
     # --- 2. Pre-calculate Total Table Height ---
+    # Wrapped lines are kept per row/column so the draw pass doesn't wrap again.
     total_row_height = 0
     row_heights = []
+    row_wrapped = []
     for row_data in data:
-        max_lines = 1
-        for key, style in column_styles.items():
-            font = fonts.get(style.get("font", "regular"), fonts["regular"])
-            font_size = style.get("font_size", 10)
-            col_width = style["width"] - (2 * cell_padding)
-            lines = wrap_text_to_width(str(row_data.get(key, "")), font, font_size, col_width)
-            max_lines = max(max_lines, len(lines))
-        row_h = max_lines * (font_size * line_spacing) + (2 * cell_padding)
+        wrapped = {}
+        text_h = 0
+        for key, font, font_size, leading, wrap_w, _, _, _, _ in cols:
+            lines = wrap_text_to_width(str(row_data.get(key, "")), font, font_size, wrap_w)
+            wrapped[key] = lines
+            text_h = max(text_h, len(lines) * leading)
+        row_wrapped.append(wrapped)
+        row_h = text_h + (2 * cell_padding)
         row_heights.append(row_h)
         total_row_height += row_h
     total_table_height = header_height + total_row_height
@@ -101,44 +153,55 @@ def draw_rounded_table(c: canvas.Canvas, x: float, y: float, config: Dict[str, A
     current_y = y
     c.setFillColor(header_fill)
     c.rect(x, current_y - header_height, table_width, header_height, stroke=0, fill=1)
-    current_x = x
-    for key, style in column_styles.items():
-        c.setFillColor(header_text_color)
-        c.setFont(header_font, header_font_size)
-        header_text = style.get("header", key.capitalize())
+    c.setFillColor(header_text_color)
+    c.setFont(header_font, header_font_size)
+    for key, *_, col_x, col_w in cols:
+        header_text = column_styles[key].get("header", key.capitalize())
         text_w = string_width(header_text, header_font, header_font_size)
         text_y = current_y - header_height/2 - header_font_size/2
-        text_x = current_x + (style["width"] / 2) - (text_w / 2)
+        text_x = col_x + (col_w / 2) - (text_w / 2)
         c.drawString(text_x, text_y, header_text)
-        current_x += style["width"]
     current_y -= header_height
+
+    row_tops = []
+    for row_h in row_heights:
+        row_tops.append(current_y)
+        current_y -= row_h
     
-    # Draw Rows
-    for i, row_data in enumerate(data):
-        row_h = row_heights[i]
+    # Draw Rows: all alt-row backgrounds as one filled path, all dividers as one stroked path
+    stripes = c.beginPath()
+    dividers = c.beginPath()
+    for i, (row_top, row_h) in enumerate(zip(row_tops, row_heights)):
         if i % 2 == 1:
-            c.setFillColor(alt_row_color)
-            c.rect(x, current_y - row_h, table_width, row_h, stroke=0, fill=1)
-        current_x = x
-        for key, style in column_styles.items():
-            font = fonts.get(style.get("font", "regular"), fonts["regular"])
-            font_size = style.get("font_size", 10)
-            text_color = style.get("text_color", default_text_color)
-            align = style.get("align", "LEFT").upper()
-            c.setFont(font, font_size)
-            c.setFillColor(text_color)
-            lines = wrap_text_to_width(str(row_data.get(key, "")), font, font_size, style["width"] - 2 * cell_padding)
-            line_y = current_y - cell_padding - font_size
+            stripes.rect(x, row_top - row_h, table_width, row_h)
+        dividers.moveTo(x, row_top - row_h)
+        dividers.lineTo(x + table_width, row_top - row_h)
+    if len(row_heights) > 1:
+        c.setFillColor(alt_row_color)
+        c.drawPath(stripes, stroke=0, fill=1)
+    if row_heights:
+        c.setStrokeColor(border_color)
+        c.drawPath(dividers, stroke=1, fill=0)
+
+    # Cell text column by column, so font and colour are set once per column
+    for key, font, font_size, leading, wrap_w, align, text_color, col_x, col_w in cols:
+        c.setFont(font, font_size, leading)
+        c.setFillColor(text_color)
+        for row_top, wrapped in zip(row_tops, row_wrapped):
+            lines = wrapped[key]
+            line_y = row_top - cell_padding - font_size
+            # Multi-line LEFT cells share one text object; RIGHT/CENTER need a per-line x
+            if align not in ("RIGHT", "CENTER") and len(lines) > 1:
+                text = c.beginText(col_x + cell_padding, line_y)
+                for line in lines: text.textLine(line)
+                c.drawText(text)
+                continue
             for line in lines:
-                if align == "RIGHT": line_x = current_x + style["width"] - cell_padding - string_width(line, font, font_size)
-                elif align == "CENTER": line_x = current_x + style["width"]/2 - string_width(line, font, font_size)/2
-                else: line_x = current_x + cell_padding
+                if align == "RIGHT": line_x = col_x + col_w - cell_padding - string_width(line, font, font_size)
+                elif align == "CENTER": line_x = col_x + col_w/2 - string_width(line, font, font_size)/2
+                else: line_x = col_x + cell_padding
                 c.drawString(line_x, line_y, line)
-                line_y -= font_size * line_spacing
-            current_x += style["width"]
-        c.setStrokeColor(border_color)
-        c.line(x, current_y - row_h, x + table_width, current_y - row_h)
-        current_y -= row_h
+                line_y -= leading
     c.restoreState() # Clipping path is now removed
 
     # --- 4. Draw the Caption Below the Table ---
@@ -147,7 +210,7 @@ def draw_rounded_table(c: canvas.Canvas, x: float, y: float, config: Dict[str, A
         style = config.get("caption_style", {})
         font = fonts.get(style.get("font", "regular"), fonts["regular"])
         font_size = style.get("font_size", 9)
-        color = style.get("text_color", colors.HexColor("#6B7280"))
+        color = style.get("text_color", _CAPTION_TEXT)
         align = style.get("align", "LEFT").upper()
         
         padding = 12
@@ -156,12 +219,18 @@ def draw_rounded_table(c: canvas.Canvas, x: float, y: float, config: Dict[str, A
         
         c.setFont(font, font_size)
         c.setFillColor(color)
-        for line in lines:
-            if align == "RIGHT": caption_x = x + table_width - string_width(line, font, font_size)
-            elif align == "CENTER": caption_x = x + table_width/2 - string_width(line, font, font_size)/2
-            else: caption_x = x
-            c.drawString(caption_x, caption_y, line)
-            caption_y -= font_size * 1.2
+        if align not in ("RIGHT", "CENTER") and len(lines) > 1:
+            text = c.beginText(x, caption_y)
+            text.setFont(font, font_size, font_size * 1.2)
+            for line in lines: text.textLine(line)
+            c.drawText(text)
+        else:
+            for line in lines:
+                if align == "RIGHT": caption_x = x + table_width - string_width(line, font, font_size)
+                elif align == "CENTER": caption_x = x + table_width/2 - string_width(line, font, font_size)/2
+                else: caption_x = x
+                c.drawString(caption_x, caption_y, line)
+                caption_y -= font_size * 1.2
 
 # ====================
 # Main PDF Builder
@@ -173,7 +242,7 @@ def create_pdf_with_table(output_filename: str, table_config: Dict[str, Any]):
     fonts = register_fonts()
     
     c.setFont(fonts["bold"], 24)
-    c.setFillColor(colors.HexColor("#111827"))
+    c.setFillColor(_DEFAULT_TEXT)
     c.drawString(0.5 * inch, PAGE_HEIGHT - 1 * inch, "Product Inventory Report")
     
     start_x = 0.5 * inch
@@ -181,7 +250,7 @@ def create_pdf_with_table(output_filename: str, table_config: Dict[str, Any]):
     
     draw_rounded_table(c, start_x, start_y, table_config, fonts)
     
-    c.save()
+    c.save()  # one write() of the in-memory PDF; no extra buffering needed
     print(f"✅ Successfully created PDF: {output_filename}")
 
 # ========================
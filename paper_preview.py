@@ -1,11 +1,19 @@
-# pip install reportlab
+# pip install reportlab  (optional: orjson for faster JSON input)
+import copy
+import functools
 import os
 import re
 import json
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads  # also takes UTF-8 bytes directly
 
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 
@@ -13,7 +21,7 @@ from reportlab.platypus import (
     BaseDocTemplate, PageTemplate, Frame,
     Paragraph, Spacer, Table, TableStyle,
     NextPageTemplate, PageBreak, FrameBreak,
-    KeepTogether, CondPageBreak
+    KeepTogether, CondPageBreak, Flowable
 )
 from reportlab.platypus import PageTemplate, Frame
 import uuid
@@ -23,7 +31,7 @@ import uuid
 # =========================================================
 
 GUTTER = 0.25 * inch  # same value you use for your two-column layout
-def to_roman(n: int) -> str:
+def _roman_full(n: int) -> str:
     """Convert an integer to a Roman numeral (1–3999)."""
     if not (0 < n < 4000):
         raise ValueError("Number out of range (must be 1–3999)")
@@ -39,17 +47,38 @@ def to_roman(n: int) -> str:
             n -= val
     return "".join(out)
 
+# section numbers rarely go past a few dozen
+_ROMAN_SMALL = ('',) + tuple(_roman_full(i) for i in range(1, 40))
+
+def to_roman(n: int) -> str:
+    """Convert an integer to a Roman numeral (1–3999)."""
+    return _ROMAN_SMALL[n] if 0 < n < len(_ROMAN_SMALL) else _roman_full(n)
+
+@functools.lru_cache(maxsize=256)
+def _heading(idx: int, title: str) -> str:
+    """Section heading text, e.g. 'III. RESULTS'."""
+    return f"{to_roman(idx)}. {title.upper()}"
 
+
+# [1], [1, 2], [1-3], [1–3] ...
+_CITE_RE = re.compile(r'\[([0-9,\-\u2013\u2014\s]+)\]')
+_DASH_SET = frozenset('-–—')
+_DASH_TABLE = str.maketrans({'–': '-', '—': '-'})
+
+@functools.lru_cache(maxsize=2048)
 def link_citations(text: str, link_color="#163b8a") -> str:
     """
     Replace [1], [1, 2], [1-3], [1–3] etc. with internal links to #ref_N.
     """
+    if '[' not in text:
+        return text
+
     def repl(m):
         inside = m.group(1)  # e.g., "1, 2" or "1-3"
         tokens = []
         for part in [p.strip() for p in inside.split(',') if p.strip()]:
-            if any(d in part for d in ('-', '–', '—')):
-                norm = part.replace('–', '-').replace('—', '-')
+            if not _DASH_SET.isdisjoint(part):
+                norm = part.translate(_DASH_TABLE)
                 try:
                     a, b = [int(x.strip()) for x in norm.split('-', 1)]
                 except Exception:
@@ -70,77 +99,152 @@ def link_citations(text: str, link_color="#163b8a") -> str:
                     tokens.append(part)
         return '[' + ', '.join(tokens) + ']'
 
-    return re.sub(r'\[([0-9,\-\u2013\u2014\s]+)\]', repl, text)
+    return _CITE_RE.sub(repl, text)
+
+
+class _BodyParagraph(Paragraph):
+    """
+    Paragraph that skips re-breaking lines when wrapped again at the same
+    width (KeepTogether, CondPageBreak and frame moves re-wrap body text).
+    split() may delete blPara (e.g. orphan/widow control), so a memo is only
+    reused while the broken lines are still there.
+    """
+    _last_wrap = None
+
+    def wrap(self, availWidth, availHeight):
+        if (self._last_wrap is None or self._last_wrap[0] != availWidth
+                or not hasattr(self, 'blPara')):
+            self._last_wrap = (availWidth, Paragraph.wrap(self, availWidth, availHeight))
+        return self._last_wrap[1]
+
+@functools.lru_cache(maxsize=4096)
+def _parsed_body_paragraph(text, style):
+    return _BodyParagraph(text, style)
+
+def _body_paragraph(text, style):
+    """
+    Body Paragraph for (text, style); the markup is parsed once and each call
+    gets its own shallow copy, since layout stores wrap state on the object.
+    """
+    return copy.copy(_parsed_body_paragraph(text, style))
 
 
 # =========================================================
 #  Author table (3 columns, wrap to new rows)
 # =========================================================
+# Shared by every author table; setStyle copies the commands, so reuse is safe
+_AUTHOR_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 4),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+
 def build_author_table(authors, doc, styles):
     """Return a 3-column author table that wraps to new rows as needed."""
     def author_cell(a):
-        inner = Table(
-            [[Paragraph(a['name'], styles['AuthorName'])],
-             [Paragraph(a['institution'], styles['AuthorInfo'])],
-             [Paragraph(a.get('contact', ''), styles['AuthorInfo'])]],
-            colWidths=[doc.width / 3.0]
-        )
-        inner.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('TOPPADDING', (0, 0), (-1, -1), 0),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-        ]))
-        return inner
+        # Name (AuthorName leading, also when it wraps) over one AuthorInfo
+        # Paragraph for institution and contact, instead of a nested 3-row Table
+        return [
+            Paragraph(a['name'], styles['AuthorName']),
+            Paragraph(f"{a['institution']}<br/>{a.get('contact', '')}", styles['AuthorInfo']),
+        ]
 
     cells = [author_cell(a) for a in authors]
     rows = [cells[i:i+3] for i in range(0, len(cells), 3)]
-    if rows and len(rows[-1]) < 3:
-        for _ in range(3 - len(rows[-1])):
-            rows[-1].append(Paragraph('', styles['AuthorInfo']))
+    missing = 3 - len(rows[-1]) if rows else 0
+    if missing:
+        # one shared blank cell is enough; it is only ever wrapped at the same width
+        rows[-1].extend([Paragraph('', styles['AuthorInfo'])] * missing)
 
     author_table = Table(rows, colWidths=[doc.width / 3.0] * 3, hAlign='CENTER')
-    author_table.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    author_table.setStyle(_AUTHOR_TABLE_STYLE)
     return author_table
 
 
 # =========================================================
 #  Table helper (inline or full-width)
 # =========================================================
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.pdfmetrics import stringWidth
 
+@functools.lru_cache(maxsize=64)
+def _char_units(font_name):
+    """
+    1000-unit advance widths indexed by Latin-1 code point, or None if the
+    font's widths can't be indexed that way (the paper only uses Type1 fonts).
+    """
+    font = pdfmetrics.getFont(font_name)
+    if getattr(font, "encName", None) == "WinAnsiEncoding":
+        # encoding order; matches Latin-1 for every printable code point
+        return list(font.widths)
+    return None
+
+def _fast_width(txt, font_name='Times-Roman', font_size=9):
+    """stringWidth(txt, font_name, font_size); Latin-1 text is summed from the width table."""
+    units = _char_units(font_name)
+    if units and txt.isprintable() and (txt.isascii() or max(txt) <= '\xff'):
+        # raw units scaled once, in ReportLab's Type1 operand order, so the
+        # result is bit-exact (summing pre-scaled glyph widths is not)
+        return sum(map(units.__getitem__, txt.encode('latin-1'))) * 0.001 * font_size
+    return stringWidth(txt, font_name, font_size)
+
+@functools.lru_cache(maxsize=8192)
 def _measure_text_width(txt, font_name='Times-Roman', font_size=9):
-    """Crude single-line width estimate for autosizing columns."""
-    return stringWidth(str(txt), font_name, font_size)
+    """Crude single-line width estimate for autosizing columns (memoized; pass a str)."""
+    return _fast_width(txt, font_name, font_size)
+
+def clear_width_cache():
+    """Drop memoized column-width measurements."""
+    _measure_text_width.cache_clear()
+
+def _col_max_width(cells, font_name, font_size, floor=0.0):
+    """
+    Widest of `cells` (at least `floor`). Measures longest-first and skips
+    ASCII cells whose length x widest glyph can't beat the best so far.
+    """
+    units = _char_units(font_name)
+    # widest ASCII glyph in raw units; scaled like _fast_width, so the bound
+    # is never below the width it stands in for
+    glyph_u = max(units[:128]) if units else None
+    best = floor
+    for c in sorted(set(cells), key=len, reverse=True):
+        if glyph_u is not None and c.isascii() and len(c) * glyph_u * 0.001 * font_size <= best:
+            continue
+        w = _measure_text_width(c, font_name, font_size)
+        if w > best:
+            best = w
+    return best
 
 def _autosize_col_widths(headers, rows, max_width,
                          base_font='Times-Roman', header_font='Times-Bold',
-                         font_size=9, min_col=36):
+                         font_size=9, min_col=36, sample_rows=256):
     """
     Compute preferred column widths from header+row content,
     then scale to fit max_width and fix rounding drift so the
     sum is EXACTLY max_width.
+
+    Only the first `sample_rows` rows are measured exactly, plus the
+    longest (by character count) cell of each column beyond them.
     """
     ncols = max(1, len(headers))
+    header_txt = [str(h) for h in headers]
+    # transpose once (padding/truncating rows to ncols)
+    columns = list(zip(*([str(c) for c in (list(row) + [''] * ncols)[:ncols]] for row in rows)))
+
     desired = [0.0] * ncols
 
     # header widths
-    for j, h in enumerate(headers):
+    for j, h in enumerate(header_txt):
         desired[j] = max(desired[j], _measure_text_width(h, header_font, font_size))
 
-    # body widths
-    for row in rows:
-        for j in range(min(ncols, len(row))):
-            desired[j] = max(desired[j], _measure_text_width(row[j], base_font, font_size))
+    # body widths: longest-first per column, pruned by the glyph bound
+    for j, col in enumerate(columns):
+        if len(col) > sample_rows:
+            col = col[:sample_rows] + (max(col[sample_rows:], key=len),)
+        desired[j] = _col_max_width(col, base_font, font_size, desired[j])
 
     # padding (L+R = 8pt)
     desired = [max(min_col, w + 8) for w in desired]
@@ -214,27 +318,121 @@ def _measure_fullwidth_table_height(headers, rows, *, doc, styles, col_widths=No
 
     return flow, measure
 
+class _PlainCell(Flowable):
+    """
+    Markup-free table cell. When the text fits on one line it is drawn with a
+    single drawString, placed the way Paragraph would place it; otherwise it
+    defers to a (lazily built) Paragraph, so wrapping is unchanged.
+    """
+    def __init__(self, text, style):
+        Flowable.__init__(self)
+        self.style = style
+        self._text = ' '.join(text.split())  # Paragraph collapses whitespace too
+        self._text_w = _measure_text_width(self._text, style.fontName, style.fontSize)
+        self._raw = text
+        self._para = None
+        self._fits = False
+
+    def _paragraph(self):
+        if self._para is None:
+            self._para = Paragraph(self._raw, self.style)
+        return self._para
+
+    def wrap(self, availWidth, availHeight):
+        st = self.style
+        self._line_w = availWidth - (st.leftIndent + st.firstLineIndent) - st.rightIndent
+        self._fits = self._text_w <= self._line_w
+        if not self._fits:
+            return self._paragraph().wrap(availWidth, availHeight)
+        self.width = availWidth
+        self.height = st.leading if self._text else 0
+        return self.width, self.height
+
+    def minWidth(self):
+        st = self.style
+        words = self._text.split(' ')
+        return max(_measure_text_width(w, st.fontName, st.fontSize) for w in words) + st.leftIndent + st.rightIndent
+
+    def split(self, availWidth, availHeight):
+        return self._paragraph().split(availWidth, availHeight)
+
+    def draw(self):
+        if not self._fits:
+            self._paragraph().drawOn(self.canv, 0, 0)
+            return
+        if not self._text:
+            return
+        st = self.style
+        x = st.leftIndent + st.firstLineIndent
+        if st.alignment == TA_CENTER:
+            x += 0.5 * (self._line_w - self._text_w)
+        elif st.alignment == TA_RIGHT:
+            x += self._line_w - self._text_w
+        canv = self.canv
+        canv.setFillColor(st.textColor)
+        canv.setFont(st.fontName, st.fontSize, st.leading)
+        canv.drawString(x, self.height - st.fontSize, self._text)
+
+@functools.lru_cache(maxsize=4096)
+def _cell_paragraph(text, style):
+    """
+    Shared cell flowable per (text, style): a _PlainCell unless the text has
+    markup. Safe because Table re-wraps each cell at its own width right
+    before drawing it.
+    """
+    if '<' in text or '&' in text:
+        return Paragraph(text, style)
+    return _PlainCell(text, style)
+
+# table colours, parsed once
+_C_GRID = colors.HexColor('#E5E7EB')
+_C_HDR_BG = colors.HexColor('#DBEAFE')
+_C_HDR_FG = colors.HexColor('#111827')
+_C_ZEBRA = colors.HexColor('#F3F4F6')
+_C_WHITE = colors.white
+
+class _WrapOnceTable(Table):
+    """
+    Table that reuses its last wrap() result when every column width is a
+    fixed number: row heights then don't depend on the available space, so
+    measuring a full-width group once covers the layout engine's wraps too.
+    """
+    _wrapped = None
+
+    def wrap(self, availWidth, availHeight):
+        if self._wrapped is None or not self._fixed_widths():
+            self._wrapped = Table.wrap(self, availWidth, availHeight)
+        self.availWidth = availWidth
+        return self._wrapped
+
+    def _fixed_widths(self):
+        return all(isinstance(w, (int, float)) for w in self._argW)
+
+    def setStyle(self, tblstyle):
+        self._wrapped = None
+        Table.setStyle(self, tblstyle)
+
 def make_table_flowables(*,
     headers, rows, caption=None, doc=None, styles=None,
     col_widths=None, zebra=True, max_width=None, wrap_mode='normal'
 ):
-    assert styles is not None and doc is not None
-
     total_w = max_width if max_width is not None else doc.width
 
-    header_cells = [Paragraph(str(h), styles['TableHeaderCell']) for h in headers]
-    body_cells = [[Paragraph(str(c), styles['TableCell']) for c in row] for row in rows]
+    header_style, cell_style = styles['TableHeaderCell'], styles['TableCell']
+    cell = _cell_paragraph
+    header_cells = [cell(str(h), header_style) for h in headers]
+    body_cells = [[cell(str(c), cell_style) for c in row] for row in rows]
 
     if col_widths is None:
         col_widths = _autosize_col_widths(headers, rows, total_w)
 
     data = [header_cells] + body_cells
 
-    tbl = Table(data, colWidths=col_widths, hAlign='CENTER', repeatRows=1)
+    tbl = _WrapOnceTable(data, colWidths=col_widths, hAlign='CENTER', repeatRows=1)
     base = [
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#E5E7EB')),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#DBEAFE')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#111827')),
+        ('GRID', (0, 0), (-1, -1), 0.25, _C_GRID),
+        ('BACKGROUND', (0, 0), (-1, 0), _C_HDR_BG),
+        ('TEXTCOLOR', (0, 0), (-1, 0), _C_HDR_FG),
         ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
         ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
         ('LEFTPADDING', (0, 0), (-1, -1), 4),
@@ -254,7 +452,7 @@ def make_table_flowables(*,
 
     if zebra and rows:
         base.append(('ROWBACKGROUNDS', (0, 1), (-1, -1),
-                     [colors.HexColor('#F3F4F6'), colors.white]))
+                     [_C_ZEBRA, _C_WHITE]))
 
     tbl.setStyle(TableStyle(base))
 
@@ -291,6 +489,22 @@ from reportlab.platypus import Image as RLImage, Paragraph
 from reportlab.lib.utils import ImageReader
 from reportlab.lib.units import inch
 
+@functools.lru_cache(maxsize=256)
+def _cached_img_dims(path):
+    return ImageReader(path).getSize()
+
+def _img_dims(path):
+    """Natural (width, height) in pixels; probed once per file path."""
+    if hasattr(path, 'read'):
+        # ImageReader would consume/close the stream RLImage still needs
+        from PIL import Image as PILImage
+        pos = path.tell()
+        try:
+            return PILImage.open(path).size
+        finally:
+            path.seek(pos)
+    return _cached_img_dims(path)
+
 def make_image_flowables(
     *,
     path,                  # file path or file-like
@@ -305,15 +519,10 @@ def make_image_flowables(
     Return [caption?, Image] sized to fit max_width (and max_height if given),
     preserving aspect ratio. Ready to insert into story.
     """
-    assert doc is not None and styles is not None
-
     total_w = max_width if max_width is not None else doc.width
 
-    img = RLImage(path)
-    img.hAlign = hAlign
-
     # Natural pixels
-    iw, ih = float(img.imageWidth), float(img.imageHeight)
+    iw, ih = map(float, _img_dims(path))
 
     # Constraints
     max_w = float(total_w)
@@ -325,8 +534,7 @@ def make_image_flowables(
     else:
         s = min(max_w / iw, 1.0 if iw <= max_w else 10**9)
 
-    img.drawWidth  = iw * s
-    img.drawHeight = ih * s
+    img = RLImage(path, width=iw * s, height=ih * s, hAlign=hAlign)
 
     out = []
     if caption:
@@ -365,63 +573,14 @@ def measure_fullwidth_image_group(
     return caption_para, image_flow, total_h
 
 # =========================================================
-#  Main builder
+#  Styles
 # =========================================================
-def create_research_paper_pdf(metadata, body_content, references_content, *, output_filename="research_paper_enhanced.pdf"):
+@functools.lru_cache(maxsize=1)
+def _build_styles():
     """
-    Build a research paper PDF with:
-      - First page: single column (title/abstract)
-      - Body: true two-column frames (no mid-page balancing)
-      - Headings kept with content; clean column/page breaks
-      - Inline & full-width tables with captions
-      - Clickable citations [1, 2–4] -> reference list
-      - References page in single column
+    Paper stylesheet, built once per process. Shared across documents, so
+    treat the returned styles as read-only.
     """
-    # -----------------------------
-    # Doc + page templates
-    # -----------------------------
-    doc = BaseDocTemplate(
-        output_filename,
-        pagesize=(8.5 * inch, 11 * inch),
-        leftMargin=0.75 * inch,
-        rightMargin=0.75 * inch,
-        topMargin=1.0 * inch,
-        bottomMargin=1.0 * inch,
-    )
-
-    # Header/Footer
-    def header_footer(canvas, doc_):
-        canvas.saveState()
-        canvas.setFont('Times-Roman', 9)
-        if doc_.page > 1:
-            pub_info = metadata.get('publication_info', {})
-            header_text = (f"{pub_info.get('journal', '')}, Vol. {pub_info.get('volume', 'N/A')}, "
-                           f"No. {pub_info.get('issue', 'N/A')}, {pub_info.get('date', '')}")
-            canvas.drawString(doc.leftMargin, 10.5 * inch, header_text)
-            canvas.line(doc.leftMargin, 10.45 * inch, doc.width + doc.leftMargin, 10.45 * inch)
-        canvas.drawCentredString(4.25 * inch, 0.5 * inch, f"Page {doc_.page}")
-        canvas.restoreState()
-
-    # First page: single frame
-    first_frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="first_frame")
-
-    # Body: two columns
-    gutter = 0.25 * inch
-    col_w = (doc.width - gutter) / 2.0
-    left_col = Frame(doc.leftMargin, doc.bottomMargin, col_w, doc.height, id="left_col")
-    right_col = Frame(doc.leftMargin + col_w + gutter, doc.bottomMargin, col_w, doc.height, id="right_col")
-
-    # One-column body (for full-width tables/figures)
-    onecol_body_frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="onecol_body_frame")
-
-    first_template   = PageTemplate(id="First",     frames=[first_frame],      onPage=header_footer)
-    twocol_template  = PageTemplate(id="TwoCol",    frames=[left_col, right_col], onPage=header_footer)
-    onecol_template  = PageTemplate(id="OneColBody", frames=[onecol_body_frame],  onPage=header_footer)
-    doc.addPageTemplates([first_template, twocol_template, onecol_template])
-
-    # -----------------------------
-    # Styles
-    # -----------------------------
     neutral_dark = colors.HexColor("#111827")
     neutral_medium_dark = colors.HexColor("#374151")
 
@@ -431,6 +590,8 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
         name='PaperTitle', fontName='Times-Bold', fontSize=22, leading=26,
         alignment=TA_CENTER, textColor=neutral_dark
     ))
+    # getSampleStyleSheet() hands out a fresh sheet, so tweaking BodyText in
+    # place only touches this (cached, built-once) copy
     styles['BodyText'].fontName = 'Times-Roman'
     styles['BodyText'].fontSize = 10
     styles['BodyText'].leading = 12
@@ -455,7 +616,10 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
     ))
     styles.add(ParagraphStyle(
         name='ReferenceText', parent=styles['BodyText'], fontSize=9, leading=11,
-        firstLineIndent=-0.25 * inch, leftIndent=0.25 * inch
+        firstLineIndent=-0.25 * inch, leftIndent=0.25 * inch,
+        # gap between references: the frames overlap this with the next
+        # reference's 6pt spaceBefore, so 10 = the old 4pt Spacer + 6pt
+        spaceAfter=10
     ))
     styles.add(ParagraphStyle(
         name='TableCaption', parent=styles['BodyText'], fontName='Times-Italic',
@@ -475,6 +639,93 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
         fontName='Times-Bold',
         alignment=TA_CENTER
     ))
+    return styles
+
+# =========================================================
+#  Main builder
+# =========================================================
+def create_research_paper_pdf(metadata, body_content, references_content, *, output_filename="research_paper_enhanced.pdf"):
+    """
+    Build a research paper PDF with:
+      - First page: single column (title/abstract)
+      - Body: true two-column frames (no mid-page balancing)
+      - Headings kept with content; clean column/page breaks
+      - Inline & full-width tables with captions
+      - Clickable citations [1, 2–4] -> reference list
+      - References page in single column
+    """
+    # the table/image helpers take doc and styles from here, so only the
+    # caller-supplied input needs checking
+    missing = [k for k in ('title', 'authors', 'summary') if k not in metadata]
+    if missing:
+        raise ValueError(f"metadata is missing required keys: {', '.join(missing)}")
+
+    # -----------------------------
+    # Doc + page templates
+    # -----------------------------
+    doc = BaseDocTemplate(
+        output_filename,
+        pagesize=(8.5 * inch, 11 * inch),
+        leftMargin=0.75 * inch,
+        rightMargin=0.75 * inch,
+        topMargin=1.0 * inch,
+        bottomMargin=1.0 * inch,
+        pageCompression=1,  # regardless of the local rl_config default
+    )
+
+    # Header/Footer (everything but the page number is fixed per document)
+    pub_info = metadata.get('publication_info', {})
+    header_text = (f"{pub_info.get('journal', '')}, Vol. {pub_info.get('volume', 'N/A')}, "
+                   f"No. {pub_info.get('issue', 'N/A')}, {pub_info.get('date', '')}")
+    header_x, header_y = doc.leftMargin, 10.5 * inch
+    rule_x1, rule_y = doc.width + doc.leftMargin, 10.45 * inch
+    footer_x, footer_y = 4.25 * inch, 0.5 * inch
+
+    def header_footer(canvas, doc_):
+        canvas.saveState()
+        canvas.setFont('Times-Roman', 9)
+        if doc_.page > 1:
+            canvas.drawString(header_x, header_y, header_text)
+            canvas.line(header_x, rule_y, rule_x1, rule_y)
+        canvas.drawCentredString(footer_x, footer_y, f"Page {doc_.page}")
+        canvas.restoreState()
+
+    # First page: single frame
+    first_frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="first_frame")
+
+    # Body: two columns
+    gutter = 0.25 * inch
+    col_w = (doc.width - gutter) / 2.0
+    left_col = Frame(doc.leftMargin, doc.bottomMargin, col_w, doc.height, id="left_col")
+    right_col = Frame(doc.leftMargin + col_w + gutter, doc.bottomMargin, col_w, doc.height, id="right_col")
+
+    # One-column body (for full-width tables/figures)
+    onecol_body_frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="onecol_body_frame")
+
+    first_template   = PageTemplate(id="First",     frames=[first_frame],      onPage=header_footer)
+    twocol_template  = PageTemplate(id="TwoCol",    frames=[left_col, right_col], onPage=header_footer)
+    onecol_template  = PageTemplate(id="OneColBody", frames=[onecol_body_frame],  onPage=header_footer)
+    doc.addPageTemplates([first_template, twocol_template, onecol_template])
+
+    # Full-width-top templates, one per distinct top height: identical figures
+    # or tables reuse one instead of growing doc.pageTemplates every time
+    fullwidth_templates = {}
+
+    def fullwidth_template(top_height, gutter_):
+        key = (top_height, gutter_)
+        tpl = fullwidth_templates.get(key)
+        if tpl is None:
+            tpl = make_fullwidth_then_two_col_template(
+                doc, top_height, gutter=gutter_, onPage=header_footer
+            )
+            doc.addPageTemplates([tpl])
+            fullwidth_templates[key] = tpl
+        return tpl
+
+    # -----------------------------
+    # Styles
+    # -----------------------------
+    styles = _build_styles()
 
     # -----------------------------
     # Build story
@@ -494,17 +745,58 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
 
     section_idx = 1
     table_counter = 1
+    body_style = styles['BodyTextPadded']
+
+    # Consecutive full-width figures/tables are queued here and stacked into
+    # one full-width top frame per page by flush_fullwidth()
+    fullwidth_pending = []
+
+    def flush_fullwidth():
+        # The measured heights leave out the caption's spaceBefore/spaceAfter
+        # and the Frame's 6pt top and bottom padding
+        cap_style = styles['TableCaption']
+        extra = cap_style.spaceBefore + cap_style.spaceAfter
+        # A group is closed before the two-column strip below it drops under
+        # this height (1in usable + its padding); a shorter strip can't take
+        # the next flowable and the build never finishes
+        max_top = doc.height - (1 * inch + 12)
+        groups = []
+        for cap_para, flow, total_h in fullwidth_pending:
+            h = total_h + extra
+            if not groups or groups[-1][0] + h > max_top:
+                groups.append([12, []])
+            groups[-1][0] += h
+            groups[-1][1].append((cap_para, flow))
+        fullwidth_pending.clear()
+
+        for top_h, members in groups:
+            if top_h > max_top:
+                # Too tall to leave a usable strip: give it a one-column page
+                # and carry on with the two-column body on the next one
+                story.append(NextPageTemplate("OneColBody"))
+            else:
+                story.append(NextPageTemplate(fullwidth_template(top_h, gutter).id))
+            story.append(PageBreak())
+            for cap_para, flow in members:
+                story.append(cap_para)
+                story.extend(flow)
+                story.append(Spacer(1, 0.06 * inch))  # already included in total_h
+            story.append(NextPageTemplate("TwoCol"))
+            if top_h > max_top:
+                story.append(FrameBreak())
 
     for item in body_content:
         itype = item.get('type')
+        placement = (item.get('placement') or 'inline').lower()
+        if fullwidth_pending and not (itype in ('image', 'table') and placement == 'fullwidth'):
+            flush_fullwidth()
 
         if itype == 'section':
             story.append(CondPageBreak(0.8 * inch))
-            heading = f"{to_roman(section_idx)}. {item['title'].upper()}"
-            story.append(Paragraph(heading, styles['H2']))
+            story.append(Paragraph(_heading(section_idx, item['title']), styles['H2']))
             section_idx += 1
 
-            paras = [Paragraph(link_citations(p), styles['BodyTextPadded'])
+            paras = [_body_paragraph(link_citations(p), body_style)
                      for p in (item.get('content') or [])]
             if paras:
                 glued = [paras[0]]
@@ -543,17 +835,7 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
                 spacer_after=0.06 * inch
             )
 
-            temp_tpl = make_fullwidth_then_two_col_template(
-                doc, total_h, gutter=GUTTER, onPage=header_footer
-            )
-            doc.addPageTemplates([temp_tpl])
-
-            story.append(NextPageTemplate(temp_tpl.id))
-            story.append(PageBreak())
-            story.append(cap_para)
-            story.extend(image_flow)
-            story.append(Spacer(1, 0.06 * inch))  # already included in total_h
-            story.append(NextPageTemplate("TwoCol"))
+            fullwidth_pending.append((cap_para, image_flow, total_h))
 
         elif itype == 'table':
             headers    = item.get('headers', [])
@@ -589,18 +871,7 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
                     spacer_after=0.06 * inch     # << keep this in sync with the Spacer below
                 )
 
-                temp_tpl = make_fullwidth_then_two_col_template(
-                    doc, total_h, gutter=gutter, onPage=header_footer
-                )
-                doc.addPageTemplates([temp_tpl])
-
-                story.append(NextPageTemplate(temp_tpl.id))
-                story.append(PageBreak())
-                story.append(cap_para)
-                story.extend(table_flow)
-                story.append(Spacer(1, 0.06 * inch))  # << already counted in total_h
-
-                story.append(NextPageTemplate("TwoCol"))
+                fullwidth_pending.append((cap_para, table_flow, total_h))
                 table_counter += 1
             else:
                 # fallback
@@ -611,15 +882,18 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
                 story.append(KeepTogether(flow))
                 story.append(Spacer(1, 0.08 * inch))
 
+    if fullwidth_pending:
+        flush_fullwidth()
+
     # References (single column for clarity)
     story.append(NextPageTemplate("First"))
     story.append(PageBreak())
     story.append(Paragraph("REFERENCES", styles['H2']))
     story.append(Spacer(1, 0.05 * inch))
+    ref_style = styles['ReferenceText']
     for i, ref in enumerate(references_content, 1):
         linked = f'<a name="ref_{i}"/>[{i}] {ref["text"]}'
-        story.append(Paragraph(linked, styles['ReferenceText']))
-        story.append(Spacer(1, 4))
+        story.append(Paragraph(linked, ref_style))
 
     # Build
     try:
@@ -631,13 +905,25 @@ def create_research_paper_pdf(metadata, body_content, references_content, *, out
         return None
 
 
+def _build_one(spec):
+    return create_research_paper_pdf(**spec)
+
+def build_many(specs, workers=None):
+    """
+    Build many papers across processes; each spec holds
+    create_research_paper_pdf kwargs. Returns the paths (None for failures).
+    """
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_build_one, specs))
+
+
 # =========================================================
 #  CLI entry for testing from JSON
 # =========================================================
 if __name__ == "__main__":
     json_path = "paper_input.json"
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(json_path, "rb") as f:
+        data = _json_loads(f.read())
 
     file_path = create_research_paper_pdf(
         metadata=data["metadata"],
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import paper_preview  # noqa: E402
+
+META = {"title": "T", "authors": [{"name": "A", "institution": "I"}], "summary": "S", "tags": ["a"]}
+REFS = [{"text": "ref"}]
+
+
+def _build(tmp_path, body):
+    out = tmp_path / "paper.pdf"
+    return paper_preview.create_research_paper_pdf(META, body, REFS, output_filename=str(out))
+
+
+def test_body_paragraphs_survive_orphan_widow_splits(tmp_path):
+    # split() under orphan/widow control drops blPara; the wrap memo must rebuild it
+    body = [{"type": "section", "title": "S",
+             "content": ["word " * (40 + 7 * i) for i in range(40)]}]
+    assert _build(tmp_path, body)
+
+
+@pytest.mark.parametrize("max_height", [280, 284, 290])
+def test_stacked_fullwidth_figures_leave_room_for_body(tmp_path, max_height):
+    # two stacked figures must not leave a two-column strip too short to use
+    img = tmp_path / "fig.png"
+    Image.new("RGB", (1200, 1800), (28, 28, 30)).save(img)
+    figure = {"type": "image", "path": str(img), "placement": "fullwidth",
+              "max_height_pts": max_height}
+    body = [dict(figure, caption="A"), dict(figure, caption="B"),
+            {"type": "section", "title": "S", "content": ["word " * 60] * 6}]
+    assert _build(tmp_path, body)
@@ -1,6 +1,11 @@
 # pip install reportlab pillow
 
+import collections
+import functools
+import io
+import math
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Literal, Tuple, List, Dict, Any
 
 from reportlab.pdfgen import canvas
@@ -18,46 +23,117 @@ from PIL import Image, ImageDraw, ImageFont
 # Typography / Layout utils
 # =========================
 
+@functools.lru_cache(maxsize=32)
+def _char_widths(font_name: str):
+    """
+    (widths, is_ttf): 1000-unit advance widths indexed by Latin-1 code point,
+    or None if the font's widths can't be indexed that way.
+    """
+    font = pdfmetrics.getFont(font_name)
+    if isinstance(font, TTFont):
+        cw, dw = font.face.charWidths, font.face.defaultWidth
+        return [cw.get(i, dw) for i in range(256)], True
+    if getattr(font, "encName", None) == "WinAnsiEncoding":
+        # encoding order; matches Latin-1 for every printable code point
+        return list(font.widths), False
+    return None
+
+@functools.lru_cache(maxsize=65536)
 def string_width(text: str, font_name: str, font_size: float) -> float:
-    """Calculates the width of a string."""
+    """Calculates the width of a string (memoized; words repeat across widgets)."""
+    table = _char_widths(font_name)
+    if table and text.isprintable() and (text.isascii() or max(text) <= "\xff"):
+        widths, is_ttf = table
+        units = sum(map(widths.__getitem__, text.encode("latin-1")))
+        # same operand order as ReportLab's TTF / Type1 sums, so results match exactly
+        return 0.001 * font_size * units if is_ttf else units * 0.001 * font_size
     return pdfmetrics.stringWidth(text, font_name, font_size)
 
 def wrap_text_to_width(text: str, font_name: str, font_size: float, max_width: float) -> List[str]:
-    """Greedy word wrap based on stringWidth."""
+    """Greedy word wrap; line widths are summed from per-word widths."""
     words = text.split()
     if not words:
         return []
-    lines, line = [], words[0]
+    space_w = string_width(" ", font_name, font_size)
+    lines, line = [], [words[0]]
+    line_w = string_width(words[0], font_name, font_size)
     for w in words[1:]:
-        test = f"{line} {w}"
-        if string_width(test, font_name, font_size) <= max_width:
-            line = test
+        word_w = string_width(w, font_name, font_size)
+        new_w = line_w + space_w + word_w
+        if new_w <= max_width:
+            line.append(w)
+            line_w = new_w
         else:
-            lines.append(line)
-            line = w
-    lines.append(line)
+            lines.append(" ".join(line))
+            line, line_w = [w], word_w
+    lines.append(" ".join(line))
     return lines
 
 def auto_fit_font_size(text: str, font_name: str, max_width: float, max_size: float, min_size: float) -> float:
-    """Find a font size that makes one line of text fit max_width (descending)."""
-    size = max_size
-    while size >= min_size:
-        if string_width(text, font_name, size) <= max_width:
-            return size
-        size -= 1
-    return min_size
+    """Find a font size that makes one line of text fit max_width (descending).
+
+    Width is linear in font size, so one 1pt measurement gives the answer
+    without stepping down size by size.
+    """
+    unit_w = string_width(text, font_name, 1.0)
+    if unit_w <= 0:
+        return max_size
+    fit = max_width / unit_w
+    if fit >= max_size:
+        return max_size
+    # Same 1pt steps down from max_size as before, clamped to min_size
+    return max(min_size, max_size - math.ceil(max_size - fit))
+
+@functools.lru_cache(maxsize=256)
+def _rgba(hex_str: str, alpha: float):
+    """Parse a hex colour once and reuse the Color object for each alpha."""
+    col = colors.HexColor(hex_str)
+    return colors.Color(col.red, col.green, col.blue, alpha=alpha)
 
 def draw_rounded_panel(c, x, y, w, h, *, radius=5, fill_hex="#000000", alpha=0.40, stroke=0):
     """Semi-opaque rounded rectangle to sit behind text."""
-    col = colors.HexColor(fill_hex)
-    c.setFillColor(colors.Color(col.red, col.green, col.blue, alpha=alpha))
+    c.setFillColor(_rgba(fill_hex, alpha))
     c.roundRect(x, y, w, h, radius, stroke=stroke, fill=1)
 
+# Widget panel chrome (same for every rectangular/square widget)
+WIDGET_PANEL = dict(radius=8, fill_hex="#1E1E24", alpha=0.85)
+
+# A stamped form costs ~50 bytes less per use than an inline panel but ~350
+# bytes once to define, so only sizes used this often become forms
+PANEL_FORM_MIN_USES = 8
+
+def define_panel_form(c, name, w, h):
+    """Record a widget panel once as a Form XObject of size w x h (place with draw_form)."""
+    # Opaque fill inside the form: the alpha ExtGState is not carried into the
+    # form's resources, so draw_widget_panel sets it on the page instead
+    col = colors.HexColor(WIDGET_PANEL["fill_hex"])
+    c.beginForm(name, lowerx=0, lowery=0, upperx=w, uppery=h)
+    c.setFillColorRGB(col.red, col.green, col.blue)
+    c.roundRect(0, 0, w, h, WIDGET_PANEL["radius"], stroke=0, fill=1)
+    c.endForm()
+
+def draw_form(c, name, x, y, alpha=None):
+    """Stamp a previously defined form with its origin at (x, y)."""
+    c.saveState()
+    c.translate(x, y)
+    if alpha is not None:
+        c.setFillAlpha(alpha)
+    c.doForm(name)
+    c.restoreState()
+
+def draw_widget_panel(c, x, y, w, h, panel_form=None):
+    """Widget background: stamp panel_form if given, otherwise draw it directly."""
+    if panel_form:
+        draw_form(c, panel_form, x, y, alpha=WIDGET_PANEL["alpha"])
+    else:
+        draw_rounded_panel(c, x, y, w, h, **WIDGET_PANEL)
+
 # ========================
 # WIDGET DRAWING FUNCTIONS
 # ========================
 
-def draw_rectangular_widget(c, x, y, w, h, content: Dict[str, Any], fonts: Dict[str, str]):
+def draw_rectangular_widget(c, x, y, w, h, content: Dict[str, Any], fonts: Dict[str, str],
+                            panel_form=None):
     """
     Draws a rectangular widget with a title, body text, sources, and a severity flag.
     """
@@ -71,7 +147,7 @@ def draw_rectangular_widget(c, x, y, w, h, content: Dict[str, Any], fonts: Dict[
     }
     
     # Main Panel
-    draw_rounded_panel(c, x, y, w, h, radius=8, fill_hex="#1E1E24", alpha=0.85)
+    draw_widget_panel(c, x, y, w, h, panel_form)
     
     # Severity Flag Bar
     flag_color = colors.HexColor(severity_colors.get(severity, "#B0B0B0"))
@@ -96,9 +172,15 @@ def draw_rectangular_widget(c, x, y, w, h, content: Dict[str, Any], fonts: Dict[
     text_lines = wrap_text_to_width(body_text, fonts["regular"], body_size, inner_w)
     
     text_y = y + h - padding - title_size
-    for line in text_lines:
-        c.drawString(inner_x, text_y, line)
-        text_y -= body_size * 1.4
+    if len(text_lines) > 1:
+        # One text object for the whole block instead of a BT/ET per line
+        body = c.beginText(inner_x, text_y)
+        body.setFont(fonts["regular"], body_size, body_size * 1.4)
+        for line in text_lines:
+            body.textLine(line)
+        c.drawText(body)
+    elif text_lines:
+        c.drawString(inner_x, text_y, text_lines[0])
 
     # Clickable Sources as Buttons
     sources = content.get("sources", [])
@@ -107,7 +189,9 @@ def draw_rectangular_widget(c, x, y, w, h, content: Dict[str, Any], fonts: Dict[
     
     source_x = x + padding
     source_y = y + padding - 10
-    
+
+    # Bound once; the loop runs per source button
+    set_fill, draw_str, link_rect = c.setFillColor, c.drawString, c.linkRect
     for source in sources:
         label = source.get("label", "Source")
         link_id = source.get("id", "")
@@ -119,23 +203,24 @@ def draw_rectangular_widget(c, x, y, w, h, content: Dict[str, Any], fonts: Dict[
         draw_rounded_panel(c, source_x, source_y, btn_w, btn_h, radius=5, fill_hex="#333338", alpha=1)
         
         # Draw button text
-        c.setFillColor(colors.white)
-        c.drawString(source_x + 10, source_y + 4, label)
+        set_fill(colors.white)
+        draw_str(source_x + 10, source_y + 4, label)
         
         # Create clickable link area
-        c.linkRect(label, link_id, (source_x, source_y, source_x + btn_w, source_y + btn_h), relative=1)
+        link_rect(label, link_id, (source_x, source_y, source_x + btn_w, source_y + btn_h), relative=1)
         
         source_x += btn_w + 10
 
 
-def draw_square_widget(c, x, y, size, content: Dict[str, Any], fonts: Dict[str, str]):
+def draw_square_widget(c, x, y, size, content: Dict[str, Any], fonts: Dict[str, str],
+                       panel_form=None):
     """
     Draws a square widget with block text.
     """
     padding = 0.2 * inch
     inner_size = size - 2 * padding
     
-    draw_rounded_panel(c, x, y, size, size, radius=8, fill_hex="#1E1E24", alpha=0.85)
+    draw_widget_panel(c, x, y, size, size, panel_form)
     
     c.setFillColor(colors.white)
     
@@ -146,14 +231,70 @@ def draw_square_widget(c, x, y, size, content: Dict[str, Any], fonts: Dict[str,
     lines = wrap_text_to_width(text, fonts["regular"], font_size, inner_size)
     
     text_y = y + size / 2 + (len(lines) * font_size * 1.2) / 2 - font_size
-    for line in lines:
-        c.drawCentredString(x + size / 2, text_y, line)
-        text_y -= font_size * 1.2
+    center_x = x + size / 2
+    if len(lines) > 1:
+        # Centred lines in one text object; each line starts at its own x
+        block = c.beginText()
+        block.setFont(fonts["regular"], font_size)
+        set_origin, text_out = block.setTextOrigin, block.textOut
+        regular, step = fonts["regular"], font_size * 1.2
+        for line in lines:
+            set_origin(center_x - string_width(line, regular, font_size) / 2, text_y)
+            text_out(line)
+            text_y -= step
+        c.drawText(block)
+    elif lines:
+        c.drawCentredString(center_x, text_y, lines[0])
 
 # ====================
 # Background image util
 # ====================
 
+# (path, mtime_ns, size) -> (ImageReader, (w, h))
+_IMAGE_CACHE = {}
+
+def _get_image(path: str):
+    """Return a cached (ImageReader, (w, h)) for path, reloading if the file changed."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    hit = _IMAGE_CACHE.get(key)
+    if hit:
+        return hit
+    img = ImageReader(path)
+    hit = _IMAGE_CACHE[key] = (img, img.getSize())
+    return hit
+
+# Target pixel density for the embedded cover image
+COVER_IMAGE_DPI = 200
+
+def _has_alpha(im) -> bool:
+    """True if a PIL image has an alpha band or palette/tRNS transparency."""
+    return im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info
+
+# (path, mtime_ns, size, px_size) -> ImageReader over the re-encoded image
+# (JPEG, or PNG when the source has transparency)
+_PREPARED_IMAGE_CACHE = {}
+
+def _get_prepared_image(path: str, px_size: Tuple[int, int]):
+    """Resample to px_size once; cached."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, px_size)
+    hit = _PREPARED_IMAGE_CACHE.get(key)
+    if hit:
+        return hit
+    im = Image.open(path)
+    # Transparent sources stay RGBA and go out as PNG so mask='auto' still applies
+    keep_alpha = _has_alpha(im)
+    im = im.convert("RGBA" if keep_alpha else "RGB").resize(px_size, Image.LANCZOS)
+    buf = io.BytesIO()
+    if keep_alpha:
+        im.save(buf, format="PNG")
+    else:
+        im.save(buf, format="JPEG", quality=90)
+    buf.seek(0)
+    hit = _PREPARED_IMAGE_CACHE[key] = ImageReader(buf)
+    return hit
+
 def draw_cover_image(
     c,
     image_path: str,
@@ -171,8 +312,7 @@ def draw_cover_image(
         c.rect(0, 0, width, height, stroke=0, fill=1)
         return
 
-    img = ImageReader(image_path)
-    img_w, img_h = img.getSize()
+    img, (img_w, img_h) = _get_image(image_path)
     img_aspect = img_h / float(img_w)
 
     draw_h = height
@@ -184,6 +324,16 @@ def draw_cover_image(
     x = (width - draw_w) / 2.0
     y = (height - draw_h) / 2.0
 
+    # Downscale oversized sources to COVER_IMAGE_DPI (never upscale)
+    px_w = int(draw_w / 72.0 * COVER_IMAGE_DPI)
+    px_h = int(draw_h / 72.0 * COVER_IMAGE_DPI)
+    if img_w > px_w:
+        img = _get_prepared_image(image_path, (px_w, px_h))
+    elif os.path.splitext(image_path)[1].lower() in (".jpg", ".jpeg"):
+        # Untouched JPEG: hand drawImage the path so the DCT stream is embedded
+        # as-is, without decoding the pixels to fingerprint an ImageReader
+        img = image_path
+
     c.drawImage(img, x, y, width=draw_w, height=draw_h, mask='auto')
 
     if darken > 0:
@@ -195,6 +345,44 @@ def draw_cover_image(
 # Main builder
 # ===========
 
+def _widget_size(widget: Dict[str, Any]):
+    """Panel (w, h) of a widget spec, or None for unknown widget types."""
+    widget_type = widget.get("type")
+    if widget_type == "rectangular":
+        return widget.get("w", 4 * inch), widget.get("h", 3 * inch)
+    if widget_type == "square":
+        size = widget.get("size", 2 * inch)
+        return size, size
+    return None
+
+@functools.lru_cache(maxsize=8)
+def _resolve_fonts(fonts_path: str, font_files: Tuple[str, str, str]) -> Dict[str, str]:
+    """
+    Register the bold/light/regular TTFs found in fonts_path (Helvetica
+    fallbacks otherwise). Resolved once per (fonts_path, font_files) per process.
+    """
+    try:
+        with os.scandir(fonts_path) as entries:
+            present = {e.name for e in entries}
+    except OSError:
+        present = set()
+
+    registered = set(pdfmetrics.getRegisteredFontNames())
+    fonts = {}
+    for role, file_name, ttf_name, fallback in zip(
+        ("bold", "light", "regular"),
+        font_files,
+        ("Poppins-Bold", "Poppins-Light", "Poppins-Regular"),
+        ("Helvetica-Bold", "Helvetica", "Helvetica"),
+    ):
+        if file_name not in present:
+            fonts[role] = fallback
+            continue
+        if ttf_name not in registered:
+            pdfmetrics.registerFont(TTFont(ttf_name, os.path.join(fonts_path, file_name)))
+        fonts[role] = ttf_name
+    return fonts
+
 def create_pdf_layout(
     output_filename="widgets_layout.pdf",
     *,
@@ -208,50 +396,37 @@ def create_pdf_layout(
     Builds the PDF with a flexible widget layout and a sources page.
     """
     # ========== Fonts ==========
-    bold_file, light_file, regular_file = font_files
-    font_bold_name = "Helvetica-Bold"
-    if os.path.exists(os.path.join(fonts_path, bold_file)):
-        pdfmetrics.registerFont(TTFont("Poppins-Bold", os.path.join(fonts_path, bold_file)))
-        font_bold_name = "Poppins-Bold"
-    
-    font_light_name = "Helvetica"
-    if os.path.exists(os.path.join(fonts_path, light_file)):
-        pdfmetrics.registerFont(TTFont("Poppins-Light", os.path.join(fonts_path, light_file)))
-        font_light_name = "Poppins-Light"
-
-    font_regular_name = "Helvetica"
-    if os.path.exists(os.path.join(fonts_path, regular_file)):
-        pdfmetrics.registerFont(TTFont("Poppins-Regular", os.path.join(fonts_path, regular_file)))
-        font_regular_name = "Poppins-Regular"
-
-    fonts = {
-        "bold": font_bold_name,
-        "light": font_light_name,
-        "regular": font_regular_name,
-    }
+    fonts = dict(_resolve_fonts(fonts_path, tuple(font_files)))
 
-    c = canvas.Canvas(output_filename, pagesize=page_size)
+    # Compress content streams even if a local rl_config turns it off
+    c = canvas.Canvas(output_filename, pagesize=page_size, pageCompression=1)
     width, height = page_size
 
     # ========== Page 1: Widgets ==========
     draw_cover_image(c, background_image_path, (width, height), darken=0.6)
 
-    all_sources = []
-    for widget in widgets:
+    # Panels whose size repeats are recorded once as a form and stamped
+    sizes = [_widget_size(widget) for widget in widgets]
+    panel_forms = {}
+    for size, count in collections.Counter(sizes).items():
+        if size and count >= PANEL_FORM_MIN_USES:
+            panel_forms[size] = f"widget_panel_{len(panel_forms)}"
+            define_panel_form(c, panel_forms[size], *size)
+
+    all_sources: Dict[str, Dict[str, Any]] = {}  # id -> source, deduped as collected
+    for widget, size in zip(widgets, sizes):
         widget_type = widget.get("type")
         x = widget.get("x", 0)
         y = widget.get("y", 0)
         content = widget.get("content", {})
+        panel_form = panel_forms.get(size)
 
         if widget_type == "rectangular":
-            w = widget.get("w", 4 * inch)
-            h = widget.get("h", 3 * inch)
-            draw_rectangular_widget(c, x, y, w, h, content, fonts)
-            if "sources" in content:
-                all_sources.extend(content["sources"])
+            draw_rectangular_widget(c, x, y, *size, content, fonts, panel_form=panel_form)
+            for source in content.get("sources", ()):
+                all_sources.setdefault(source['id'], source)
         elif widget_type == "square":
-            size = widget.get("size", 2 * inch)
-            draw_square_widget(c, x, y, size, content, fonts)
+            draw_square_widget(c, x, y, size[0], content, fonts, panel_form=panel_form)
 
     # ========== Page 2: Sources ==========
     if all_sources:
@@ -266,9 +441,7 @@ def create_pdf_layout(
         c.setFont(fonts["regular"], 12)
         source_y = height - 1.5 * inch
         
-        unique_sources = {s['id']: s for s in all_sources}.values()
-
-        for source in unique_sources:
+        for source in all_sources.values():
             c.bookmarkPage(source['id'])
             c.addOutlineEntry(source['label'], source['id'], 0, 0)
             c.drawString(1 * inch, source_y, f"{source['label']}: {source['details']}")
@@ -277,6 +450,18 @@ def create_pdf_layout(
     c.save()
     print(f"Successfully created PDF: {output_filename}")
 
+def _build_one(spec: Dict[str, Any]) -> str:
+    create_pdf_layout(**spec)
+    return spec.get("output_filename", "widgets_layout.pdf")
+
+def build_many(specs, workers=None) -> List[str]:
+    """
+    Render many layouts across processes; each spec holds create_pdf_layout
+    kwargs. Fonts are resolved/registered per worker process.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_build_one, specs))
+
 # =========
 # Demo main
 # =========
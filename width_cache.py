@@ -0,0 +1,80 @@
+# pip install reportlab
+#
+# Opt-in on-disk width cache (PDFGEN_WIDTH_CACHE=1) shared by coversheet.py and
+# create_table.py: warmed at import, saved at exit.
+# Keys are (font fingerprint, size, text); the fingerprint includes the TTF's mtime/size.
+
+import atexit
+import collections
+import functools
+import json
+import os
+
+from reportlab.pdfbase import pdfmetrics
+
+_PERSIST_WIDTHS = os.environ.get("PDFGEN_WIDTH_CACHE") == "1"
+_WIDTH_CACHE_FILE = os.environ.get("PDFGEN_WIDTH_CACHE_FILE", ".stringwidth_cache.json")
+_WIDTH_CACHE_MAX = 200_000
+_WIDTH_CACHE = collections.OrderedDict()
+
+@functools.lru_cache(maxsize=None)
+def _font_fingerprint(font_name: str) -> str:
+    path = getattr(pdfmetrics.getFont(font_name).face, "filename", None)
+    if path and os.path.exists(path):
+        st = os.stat(path)
+        return f"{font_name}:{st.st_mtime_ns}:{st.st_size}"
+    return font_name
+
+def _valid_entry(entry) -> bool:
+    """[fingerprint, size, text, width] as written by _save_width_cache."""
+    if not isinstance(entry, list) or len(entry) != 4:
+        return False
+    fp, size, text, w = entry
+    number = (int, float)
+    return (isinstance(fp, str) and isinstance(text, str)
+            and isinstance(size, number) and not isinstance(size, bool)
+            and isinstance(w, number) and not isinstance(w, bool))
+
+def _read_width_cache_file():
+    """Entries of the cache file; malformed entries (or a malformed file) are skipped."""
+    try:
+        with open(_WIDTH_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, list):
+        return []
+    return [tuple(entry) for entry in data if _valid_entry(entry)]
+
+def _save_width_cache():
+    # Merge with whatever is on disk so other scripts' entries survive
+    merged = collections.OrderedDict(((fp, size, text), w) for fp, size, text, w in _read_width_cache_file())
+    merged.update(_WIDTH_CACHE)
+    while len(merged) > _WIDTH_CACHE_MAX:
+        merged.popitem(last=False)
+    tmp_path = f"{_WIDTH_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([[fp, size, text, w] for (fp, size, text), w in merged.items()], f)
+        os.replace(tmp_path, _WIDTH_CACHE_FILE)
+    except OSError as e:
+        print(f"Warning: could not save width cache: {e}")
+
+if _PERSIST_WIDTHS:
+    for fp, size, text, w in _read_width_cache_file():
+        _WIDTH_CACHE[(fp, size, text)] = w
+    atexit.register(_save_width_cache)
+
+def measure(text: str, font_name: str, font_size: float) -> float:
+    """pdfmetrics.stringWidth, served from the on-disk cache when it is enabled."""
+    if not _PERSIST_WIDTHS:
+        return pdfmetrics.stringWidth(text, font_name, font_size)
+    key = (_font_fingerprint(font_name), font_size, text)
+    w = _WIDTH_CACHE.get(key)
+    if w is None:
+        w = _WIDTH_CACHE[key] = pdfmetrics.stringWidth(text, font_name, font_size)
+        if len(_WIDTH_CACHE) > _WIDTH_CACHE_MAX:
+            _WIDTH_CACHE.popitem(last=False)
+    else:
+        _WIDTH_CACHE.move_to_end(key)
+    return w